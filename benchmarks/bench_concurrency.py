@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 *-*
+import argparse
+import os.path as path
+import subprocess
+import sys
+import time
+
+import jolokia_stub
+
+"""
+    Measures the wall-clock time of the queueage mode against a slow Jolokia stub
+    for different queue counts, bulk sizes and concurrency limits. """
+
+PLUGIN = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'check_activemq.py')
+
+
+def run_check(port, *plugin_args):
+    started = time.time()
+    process = subprocess.run([sys.executable, PLUGIN, '--port', str(port), '--timeout', '600'] + list(plugin_args),
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    return time.time() - started, process.stdout.split(' - ', 1)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='Seconds every HTTP request to the stub is delayed. (default: %(default)s)')
+    parser.add_argument('--queues', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--bulk-size', type=int, nargs='+', default=[1, 100])
+    args = parser.parse_args()
+
+    print('%8s %10s %12s %10s %10s  %s' % ('queues', 'bulk-size', 'concurrency', 'requests', 'seconds', 'status'))
+    for queues in args.queues:
+        server, stats = jolokia_stub.start(jolokia_stub.Broker(queues), args.latency)
+        port = server.server_address[1]
+        for bulk_size in args.bulk_size:
+            for concurrency in args.concurrency:
+                before = stats.http_requests
+                seconds, status = run_check(port, '--bulk-size', str(bulk_size),
+                                            '--concurrency', str(concurrency), 'queueage')
+                print('%8d %10d %12d %10d %10.3f  %s' % (queues, bulk_size, concurrency,
+                                                       stats.http_requests - before, seconds, status))
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 *-*
+import argparse
+import codecs
+import json
+import os.path as path
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+import activemq_nagios_plugin  # noqa: E402
+
+"""
+    Compares peak memory and time of decoding a listQueues response at once
+    (the response, then the JSON document embedded in its value) against
+    streaming it into QueueRecords chunk by chunk. """
+
+
+def list_queues_response(queues):
+    data = [{
+        'id': str(i), 'name': 'queue.%d' % i, 'address': 'queue.%d' % i, 'filter': '', 'rate': '0.00',
+        'durable': 'true', 'paused': 'false', 'temporary': 'false', 'purgeOnNoConsumers': 'false',
+        'consumerCount': '1', 'maxConsumers': '-1', 'autoCreated': 'false', 'user': '', 'routingType': 'ANYCAST',
+        'messagesAdded': str(i * 3), 'messageCount': str(i % 7), 'messagesAcked': str(i * 2),
+        'deliveringCount': '0', 'messagesKilled': '0', 'directDeliver': 'true', 'exclusive': 'false',
+        'lastValue': 'false', 'scheduledCount': '0', 'groupRebalance': 'false', 'groupBuckets': '-1',
+    } for i in range(queues)]
+    value = json.dumps({'data': data, 'count': queues})
+    return json.dumps({'request': {'type': 'exec', 'operation': 'listQueues(java.lang.String,int,int)'},
+                       'value': value, 'timestamp': 0, 'status': 200}).encode('utf-8')
+
+
+def decode_at_once(body):
+    response = json.loads(body.decode('utf-8'))
+    for queue in json.loads(response['value'])['data']:
+        yield activemq_nagios_plugin.QueueRecord.from_json(queue)
+
+
+def decode_stream(body):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    size = activemq_nagios_plugin.STREAM_CHUNK_SIZE
+    return activemq_nagios_plugin.QueueListStream(decoder.decode(body[i:i + size]) for i in range(0, len(body), size))
+
+
+def measure(decode, body):
+    """ Returns seconds and peak memory of decoding the body into records which
+        are dropped right away, like the queuesize mode does. Memory is traced in
+        a second run, as tracing slows down allocations considerably. """
+    started = time.time()
+    for _ in decode(body):
+        pass
+    seconds = time.time() - started
+    tracemalloc.start()
+    for _ in decode(body):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--queues', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print('%8s %12s %8s %14s %10s' % ('queues', 'response', 'parser', 'peak memory', 'seconds'))
+    for queues in args.queues:
+        body = list_queues_response(queues)
+        for name, decode in (('at once', decode_at_once), ('stream', decode_stream)):
+            seconds, peak = measure(decode, body)
+            print('%8d %12d %8s %14d %10.3f' % (queues, len(body), name, peak, seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 *-*
+import argparse
+
+import jolokia_stub
+from bench_concurrency import run_check
+
+"""
+    Compares the queuesize engines: listQueues (all attributes of every queue,
+    decoded twice) against a wildcard read of the MessageCount attribute. """
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds every HTTP request to the stub is delayed. (default: %(default)s)')
+    parser.add_argument('--queues', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--padding', type=int, default=400,
+                        help='Additional bytes per queue record in listQueues responses. (default: %(default)s)')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    print('%8s %12s %10s %12s %10s' % ('queues', 'engine', 'requests', 'bytes', 'seconds'))
+    for queues in args.queues:
+        server, stats = jolokia_stub.start(jolokia_stub.Broker(queues, padding=args.padding), args.latency)
+        port = server.server_address[1]
+        for engine in ('list', 'attributes'):
+            requests, size, seconds = stats.http_requests, stats.bytes_sent, []
+            for _ in range(args.runs):
+                seconds.append(run_check(port, 'queuesize', '--engine', engine)[0])
+            print('%8d %12s %10d %12d %10.3f' % (queues, engine, (stats.http_requests - requests) / args.runs,
+                                                 (stats.bytes_sent - size) / args.runs, min(seconds)))
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
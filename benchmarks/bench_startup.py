@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 *-*
+import argparse
+import subprocess
+import sys
+import time
+
+import jolokia_stub
+from bench_concurrency import PLUGIN
+
+"""
+    Measures the cold start of the plugin: the time each mode spends importing
+    modules (as reported by python -X importtime) and its wall-clock time
+    against a local Jolokia stub, next to the start of a bare interpreter. """
+
+MODES = [
+    ('health', ['health']),
+    ('exists', ['exists', '--name', 'queue.0']),
+    ('queuesize', ['queuesize']),
+    ('queueage', ['queueage']),
+    ('dlq', ['dlq']),
+]
+
+
+def import_times(stderr):
+    """ Returns the total import time and the cumulative time per top-level
+        import in microseconds, from the output of -X importtime. """
+    total, top_level = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        total += int(self_us)
+        if not name.startswith('  '):
+            top_level[name.strip()] = int(cumulative_us)
+    return total, top_level
+
+
+def run(command, repeat):
+    """ Runs command repeat times. Returns the fastest wall time and the import
+        times of that run. """
+    runs = []
+    for _ in range(repeat):
+        started = time.time()
+        process = subprocess.run([sys.executable, '-X', 'importtime'] + command,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+        runs.append((time.time() - started, import_times(process.stderr)))
+    return min(runs, key=lambda r: r[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per mode, the fastest one is reported. (default: %(default)s)')
+    parser.add_argument('--modes', nargs='+', choices=[name for name, _ in MODES],
+                        default=[name for name, _ in MODES])
+    parser.add_argument('--heaviest', type=int, default=5,
+                        help='Number of the slowest top-level imports listed per mode. (default: %(default)s)')
+    args = parser.parse_args()
+
+    server, _ = jolokia_stub.start(jolokia_stub.Broker(100, dlqs=10))
+    port = server.server_address[1]
+    print('%-12s %10s %12s  %s' % ('mode', 'wall ms', 'imports ms', 'heaviest imports (cumulative ms)'))
+    try:
+        wall, (total, _) = run(['-c', 'pass'], args.repeat)
+        print('%-12s %10.1f %12.1f' % ('interpreter', wall * 1000, total / 1000.0))
+        for name, plugin_args in MODES:
+            if name not in args.modes:
+                continue
+            wall, (total, top_level) = run([PLUGIN, '--port', str(port)] + plugin_args, args.repeat)
+            heaviest = sorted(top_level.items(), key=lambda item: -item[1])[:args.heaviest]
+            print('%-12s %10.1f %12.1f  %s' % (name, wall * 1000, total / 1000.0,
+                                               ', '.join('%s %.1f' % (module, us / 1000.0)
+                                                         for module, us in heaviest)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 *-*
+import argparse
+import fnmatch
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import unquote
+
+"""
+    A minimal stand-in for the Jolokia agent of an Artemis broker.
+
+    It answers the requests check_activemq.py sends (listQueues, browse,
+    Started, queue reads, wildcard reads and bulk POSTs) for a configurable
+    number of synthetic queues, optionally delaying every HTTP request to
+    emulate a slow broker. """
+
+PREFIX = 'org.apache.activemq.artemis:'
+
+
+class Broker(object):
+    def __init__(self, queues=100, name='localhost', padding=0, dlqs=0, topics=0, age_attributes=True):
+        self.name = name
+        self.age_attributes = age_attributes
+        self.padding = 'x' * padding
+        self.started = True
+        now = datetime.now(timezone(timedelta(hours=1)))
+        self.queues = {}
+        for i in range(queues):
+            self.add_queue('queue.%d' % i, i % 7, now - timedelta(minutes=i % 50))
+        for i in range(dlqs):
+            self.add_queue('DLQ.%d' % i, i % 3, now - timedelta(minutes=5))
+        for i in range(topics):
+            self.add_queue('topic.%d' % i, 0, None, routing_type='MULTICAST')
+
+    def add_queue(self, name, count, oldest, routing_type='ANYCAST', address=None):
+        self.queues[name] = {
+            'id': str(len(self.queues)), 'name': name, 'address': address or name, 'routingType': routing_type,
+            'messageCount': str(count), 'consumerCount': '0', 'messagesAdded': str(count * 3),
+            'messagesAcked': str(count * 2), 'durable': 'true', 'filter': self.padding,
+            'oldest': oldest,
+        }
+
+    def mbean(self, queue):
+        return PREFIX + 'broker="{}",component=addresses,address="{}",subcomponent=queues,' \
+                        'routing-type="{}",queue="{}"'.format(self.name, queue['address'],
+                                                              queue['routingType'].lower(), queue['name'])
+
+    @staticmethod
+    def record(queue):
+        return dict((k, v) for k, v in queue.items() if k != 'oldest')
+
+    def list_queues(self, filter_json, page, page_size):
+        queue_filter = json.loads(filter_json) if filter_json else {}
+        operation, value = queue_filter.get('operation'), queue_filter.get('value')
+        queues = sorted(self.queues.values(), key=lambda q: int(q['id']))
+        if operation == 'EQUALS':
+            queues = [q for q in queues if q['name'] == value]
+        elif operation == 'CONTAINS':
+            queues = [q for q in queues if value in q['name']]
+        start = (page - 1) * page_size
+        return json.dumps({'data': [self.record(q) for q in queues[start:start + page_size]], 'count': len(queues)})
+
+    def browse(self, properties):
+        queue = self.queues.get(properties.get('queue'))
+        if queue is None or queue['routingType'].lower() != properties.get('routing-type'):
+            raise KeyError(properties.get('queue'))
+        if not queue['oldest'] or queue['messageCount'] == '0':
+            return []
+        return [{'messageID': 1, 'timestamp': queue['oldest'].isoformat(timespec='seconds')}]
+
+    def attribute(self, queue, name):
+        if name == 'MessageCount':
+            return int(queue['messageCount'])
+        if name == 'ConsumerCount':
+            return int(queue['consumerCount'])
+        if name == 'Name':
+            return queue['name']
+        if name in ('FirstMessageAge', 'FirstMessageTimestamp') and self.age_attributes:
+            if not queue['oldest'] or queue['messageCount'] == '0':
+                return None
+            timestamp = int(queue['oldest'].timestamp() * 1000)
+            return int(time.time() * 1000) - timestamp if name == 'FirstMessageAge' else timestamp
+        raise KeyError(name)
+
+    def handle(self, request):
+        mbean = request.get('mbean', '')
+        properties = parse_properties(mbean)
+        if properties.get('broker') != self.name:
+            return error(404, 'javax.management.InstanceNotFoundException : ' + mbean)
+        if request['type'] == 'read':
+            attribute = request.get('attribute')
+            if 'component' not in properties:
+                if attribute == 'Started':
+                    return ok(self.started)
+                return error(404, 'javax.management.AttributeNotFoundException : ' + str(attribute))
+            if any(c in mbean for c in '*?'):
+                attributes = attribute if isinstance(attribute, list) else [attribute]
+                value = {}
+                for queue in self.queues.values():
+                    if matches(properties, parse_properties(self.mbean(queue))):
+                        value[self.mbean(queue)] = {}
+                        for a in attributes:
+                            try:
+                                value[self.mbean(queue)][a] = self.attribute(queue, a)
+                            except KeyError:
+                                if not request.get('config', {}).get('ignoreErrors'):
+                                    return error(404, 'javax.management.AttributeNotFoundException : ' + a)
+                return ok(value)
+            queue = self.queues.get(properties.get('queue'))
+            if queue is None or queue['routingType'].lower() != properties.get('routing-type') \
+                    or queue['address'] != properties.get('address'):
+                return error(404, 'javax.management.InstanceNotFoundException : ' + mbean)
+            if attribute is None:
+                return ok(dict((a, self.attribute(queue, a)) for a in ('Name', 'MessageCount', 'ConsumerCount')))
+            return ok(self.attribute(queue, attribute))
+        if request['type'] == 'exec':
+            operation, arguments = request.get('operation'), request.get('arguments', [])
+            if operation.startswith('listQueues'):
+                return ok(self.list_queues(arguments[0], int(arguments[1]), int(arguments[2])))
+            if operation.startswith('browse'):
+                try:
+                    return ok(self.browse(properties))
+                except KeyError:
+                    return error(404, 'javax.management.InstanceNotFoundException : ' + mbean)
+        return error(400, 'unsupported request')
+
+
+def parse_properties(mbean):
+    properties = {}
+    for part in mbean[len(PREFIX):].split(','):
+        if '=' in part:
+            key, value = part.split('=', 1)
+            properties[key] = value.strip('"')
+    return properties
+
+
+def matches(pattern, properties):
+    return all(fnmatch.fnmatchcase(properties.get(k, ''), v) for k, v in pattern.items())
+
+
+def ok(value):
+    return {'status': 200, 'value': value, 'timestamp': int(time.time())}
+
+
+def error(status, message):
+    return {'status': status, 'error': message, 'error_type': message.split(' ')[0]}
+
+
+def parse_get_path(path):
+    """ Splits a Jolokia GET path (after the agent base url) into a request dict. """
+    path = unquote(path.split('?', 1)[0]).lstrip('/')
+    request_type, _, rest = path.partition('/')
+    mbean, _, rest = rest.partition('/')
+    if request_type == 'read':
+        return {'type': 'read', 'mbean': mbean, 'attribute': rest or None}
+    if request_type == 'exec':
+        # the listQueues filter is a JSON document which never contains a slash
+        parts = rest.split('/')
+        return {'type': 'exec', 'mbean': mbean, 'operation': parts[0], 'arguments': parts[1:]}
+    return {'type': request_type, 'mbean': mbean}
+
+
+class Stats(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.http_requests = 0
+        self.jolokia_requests = 0
+        self.bytes_sent = 0
+        # Jolokia requests per operation (listQueues, browse) or type (read)
+        self.operations = {}
+
+    def count(self, jolokia_requests):
+        with self.lock:
+            self.http_requests += 1
+            self.jolokia_requests += len(jolokia_requests)
+            for request in jolokia_requests:
+                operation = (request.get('operation') or request.get('type')).split('(')[0]
+                self.operations[operation] = self.operations.get(operation, 0) + 1
+
+    def sent(self, size):
+        with self.lock:
+            self.bytes_sent += size
+
+
+def make_handler(broker, base_path, latency, stats):
+    class JolokiaHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            stats.sent(len(body))
+
+        def do_GET(self):
+            if not self.path.startswith(base_path):
+                self.send_error(404)
+                return
+            request = parse_get_path(self.path[len(base_path):])
+            stats.count([request])
+            time.sleep(latency)
+            self.reply(broker.handle(request))
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8'))
+            time.sleep(latency)
+            if isinstance(body, list):
+                stats.count(body)
+                self.reply([dict(broker.handle(r), request=r) for r in body])
+            else:
+                stats.count([body])
+                self.reply(dict(broker.handle(body), request=body))
+
+    return JolokiaHandler
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def start(broker, latency=0.0, port=0, base_path='/console/jolokia/'):
+    """ Starts the stub in a background thread and returns (server, stats). """
+    stats = Stats()
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(broker, base_path, latency, stats))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=8161)
+    parser.add_argument('--queues', type=int, default=100)
+    parser.add_argument('--dlqs', type=int, default=0)
+    parser.add_argument('--topics', type=int, default=0)
+    parser.add_argument('--padding', type=int, default=0,
+                        help='Additional bytes per queue record in listQueues responses.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds every HTTP request is delayed.')
+    parser.add_argument('--no-age-attributes', action='store_true',
+                        help='Behave like a broker without the FirstMessageAge/FirstMessageTimestamp attributes.')
+    parser.add_argument('-b', '--brokerName', default='localhost')
+    args = parser.parse_args()
+    server, _ = start(Broker(args.queues, args.brokerName, args.padding, args.dlqs, args.topics,
+                             not args.no_age_attributes),
+                      args.latency, args.port)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 *-*
+import argparse
+import json
+import os
+import os.path as path
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import jolokia_stub
+from bench_concurrency import PLUGIN
+
+"""
+    Runs every mode of the plugin against the Jolokia stub and records wall time,
+    CPU time, peak RSS and the requests and bytes the stub served for each run.
+    The results are written as JSON, and can be compared with the results of
+    another version of the plugin with --compare. """
+
+SCENARIOS = [
+    ('queuesize', ['queuesize']),
+    ('queuesize-attributes', ['queuesize', '--engine', 'attributes']),
+    ('queuesize-aggregate', ['queuesize', '--aggregate']),
+    ('queueage', ['queueage', '-w', '1000', '-c', '2000']),
+    ('queueage-attributes', ['queueage', '--engine', 'attributes', '-w', '1000', '-c', '2000']),
+    ('health', ['health']),
+    ('exists', ['exists', '--name', 'queue.0']),
+    ('dlq', ['dlq']),
+]
+
+
+def run_plugin(port, cachedir, plugin_args):
+    """ Runs the plugin once. Returns (wall seconds, cpu seconds, peak rss in kB, status). """
+    started = time.time()
+    process = subprocess.Popen([sys.executable, PLUGIN, '--port', str(port), '--timeout', '600',
+                                '--cachedir', cachedir] + plugin_args,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    output = process.stdout.read()
+    process.stdout.close()
+    # wait4 reports the resource usage of exactly this child
+    _, exit_status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(exit_status)
+    return (time.time() - started, usage.ru_utime + usage.ru_stime, usage.ru_maxrss,
+            output.split(' - ', 1)[0].split(':', 1)[0])
+
+
+def run_scenario(port, stats, cachedir, plugin_args, repeat):
+    runs = []
+    for _ in range(repeat):
+        http_requests, jolokia_requests, bytes_sent = stats.http_requests, stats.jolokia_requests, stats.bytes_sent
+        wall, cpu, maxrss, status = run_plugin(port, cachedir, plugin_args)
+        runs.append({'wall': round(wall, 4), 'cpu': round(cpu, 4), 'maxrss_kb': maxrss, 'status': status,
+                     'http_requests': stats.http_requests - http_requests,
+                     'jolokia_requests': stats.jolokia_requests - jolokia_requests,
+                     'bytes': stats.bytes_sent - bytes_sent})
+    # the fastest run is the least disturbed one
+    return min(runs, key=lambda run: run['wall'])
+
+
+def compare(results, baseline_file):
+    with open(baseline_file, 'r') as baseline:
+        before = dict(((r['scenario'], r['queues']), r) for r in json.load(baseline)['results'])
+    print('\n%-22s %8s %10s %10s %10s' % ('compared to ' + path.basename(baseline_file), 'queues',
+                                          'wall', 'cpu', 'maxrss'))
+    for result in results:
+        old = before.get((result['scenario'], result['queues']))
+        if old:
+            print('%-22s %8d %9.2fx %9.2fx %9.2fx' % (
+                result['scenario'], result['queues'], result['wall'] / max(old['wall'], 1e-9),
+                result['cpu'] / max(old['cpu'], 1e-9), result['maxrss_kb'] / float(max(old['maxrss_kb'], 1))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--queues', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--dlqs', type=int, default=10)
+    parser.add_argument('--topics', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds every HTTP request to the stub is delayed. (default: %(default)s)')
+    parser.add_argument('--padding', type=int, default=0,
+                        help='Additional bytes per queue record in listQueues responses. (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per scenario, the fastest one is recorded. (default: %(default)s)')
+    parser.add_argument('--scenarios', nargs='+', choices=[name for name, _ in SCENARIOS],
+                        default=[name for name, _ in SCENARIOS])
+    parser.add_argument('--output', default='benchmark-results.json',
+                        help='JSON file the results are written to. (default: %(default)s)')
+    parser.add_argument('--label', default='',
+                        help='Label of the measured version stored with the results, e.g. a git revision.')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='Results of another version to print the ratios against.')
+    args = parser.parse_args()
+
+    cachedir = tempfile.mkdtemp(prefix='activemq-bench-')
+    results = []
+    print('%-22s %8s %10s %10s %10s %10s %12s  %s' % ('scenario', 'queues', 'wall', 'cpu', 'maxrss_kb',
+                                                     'requests', 'bytes', 'status'))
+    try:
+        for queues in args.queues:
+            server, stats = jolokia_stub.start(jolokia_stub.Broker(queues, padding=args.padding, dlqs=args.dlqs,
+                                                                   topics=args.topics), args.latency)
+            port = server.server_address[1]
+            for name, plugin_args in SCENARIOS:
+                if name not in args.scenarios:
+                    continue
+                result = dict(scenario=name, queues=queues,
+                              **run_scenario(port, stats, cachedir, plugin_args, args.repeat))
+                results.append(result)
+                print('%-22s %8d %10.3f %10.3f %10d %10d %12d  %s' % (
+                    name, queues, result['wall'], result['cpu'], result['maxrss_kb'], result['http_requests'],
+                    result['bytes'], result['status']))
+            server.shutdown()
+            server.server_close()
+    finally:
+        shutil.rmtree(cachedir, ignore_errors=True)
+
+    with open(args.output, 'w') as output:
+        json.dump({'label': args.label, 'timestamp': int(time.time()), 'python': platform.python_version(),
+                   'settings': {'latency': args.latency, 'padding': args.padding, 'dlqs': args.dlqs,
+                                'topics': args.topics, 'repeat': args.repeat},
+                   'results': results}, output, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()